@@ -0,0 +1,159 @@
+# benchmark.py
+# 오프라인 벤치마크: Streamlit·네트워크 없이 로컬에서 만든 대역(stand-in) learner와 합성 이미지로
+# 디코딩 / 단일 vs 배치 추론 / 스케줄러 처리량·지연 시간을 측정한다.
+#
+#   python benchmark.py
+#   python benchmark.py --arch resnet18 --backends learner,torchscript,torchscript-int8 --jsonl bench.jsonl
+
+import argparse, json, os, sys, tempfile, time
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+import numpy as np
+from PIL import Image
+
+from image_utils import load_pil_from_bytes
+from inference import build_backend
+from metrics import StageMetrics
+from scheduler import BatchScheduler
+
+RESOLUTIONS = {"vga": (640, 480), "fhd": (1920, 1080), "12mp": (4000, 3000)}
+FORMATS = ("JPEG", "PNG", "WEBP")
+
+# ======================
+# 합성 입력 / 대역 learner
+# ======================
+def synthetic_image(w: int, h: int, seed: int = 0) -> Image.Image:
+    """그라디언트 + 노이즈 (실사진과 비슷하게 적당히 압축되는 정도)."""
+    rng = np.random.default_rng(seed)
+    yy, xx = np.mgrid[0:h, 0:w].astype(np.float32)
+    base = np.stack([xx / w, yy / h, (xx + yy) / (w + h)], axis=-1) * 200
+    noise = rng.normal(0, 12, (h, w, 3))
+    return Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8))
+
+def encode(img: Image.Image, fmt: str) -> bytes:
+    buf = BytesIO()
+    img.save(buf, format=fmt, **({"quality": 90} if fmt in ("JPEG", "WEBP") else {}))
+    return buf.getvalue()
+
+def build_standin_learner(workdir: str, arch: str = "tiny", n_classes: int = 3, size: int = 224):
+    """합성 이미지 폴더로 DataLoaders를 만들고 학습하지 않은 모델을 붙인 Learner (다운로드 없음)."""
+    from fastai.vision.all import (ImageDataLoaders, Resize, Learner, CrossEntropyLossFlat,
+                                   ConvLayer, Flatten, vision_learner, resnet18, resnet34)
+    from torch import nn
+    for c in range(n_classes):
+        os.makedirs(os.path.join(workdir, f"class{c}"), exist_ok=True)
+        for i in range(4):
+            synthetic_image(96, 96, seed=c * 10 + i).save(os.path.join(workdir, f"class{c}", f"{i}.png"))
+    dls = ImageDataLoaders.from_folder(workdir, valid_pct=0.25, seed=0, item_tfms=Resize(size),
+                                      bs=4, num_workers=0)
+    if arch == "tiny":
+        model = nn.Sequential(ConvLayer(3, 16, stride=2), ConvLayer(16, 32, stride=2), ConvLayer(32, 64, stride=2),
+                              nn.AdaptiveAvgPool2d(1), Flatten(), nn.Linear(64, dls.c))
+        return Learner(dls, model, loss_func=CrossEntropyLossFlat())
+    return vision_learner(dls, {"resnet18": resnet18, "resnet34": resnet34}[arch], pretrained=False)
+
+# ======================
+# 측정
+# ======================
+def run_case(results: list, bench: str, case: str, fn, calls: int, items_per_call: int = 1, warmup: int = 2):
+    for _ in range(warmup):
+        fn()
+    m = StageMetrics(window=calls)
+    t0 = time.perf_counter()
+    for _ in range(calls):
+        with m.time(case):
+            fn()
+    total = time.perf_counter() - t0
+    s = m.summary()[case]
+    row = {"bench": bench, "case": case, "calls": calls, "items_per_call": items_per_call,
+           "p50_ms": s["p50_ms"], "p95_ms": s["p95_ms"], "p99_ms": s["p99_ms"],
+           "items_per_s": calls * items_per_call / total}
+    results.append(row)
+    print(f"{bench:<10} {case:<34} p50 {row['p50_ms']:8.2f}ms  p95 {row['p95_ms']:8.2f}ms  "
+          f"p99 {row['p99_ms']:8.2f}ms  {row['items_per_s']:8.1f} items/s")
+
+def bench_decode(results, side: int, repeats: int):
+    for res, (w, h) in RESOLUTIONS.items():
+        img = synthetic_image(w, h)
+        for fmt in FORMATS:
+            try:
+                b = encode(img, fmt)
+            except (KeyError, OSError):
+                continue  # 이 Pillow 빌드에 해당 코덱 없음
+            run_case(results, "decode", f"{res}/{fmt.lower()}/full", lambda: load_pil_from_bytes(b), repeats)
+            run_case(results, "decode", f"{res}/{fmt.lower()}/to-{side}", lambda: load_pil_from_bytes(b, side), repeats)
+
+def bench_inference(results, backend, images, batch_sizes, repeats: int):
+    run_case(results, "infer", f"{backend.name}/single", lambda: backend.predict_probs(images[:1]), repeats)
+    for bs in batch_sizes:
+        batch = (images * (bs // len(images) + 1))[:bs]
+        run_case(results, "infer", f"{backend.name}/batch{bs}", lambda: backend.predict_probs(batch),
+                 max(1, repeats // 2), items_per_call=bs)
+
+def bench_scheduler(results, backend, images, clients: int, requests: int, max_batch: int, max_wait_ms: float):
+    sched = BatchScheduler(backend, max_batch_size=max_batch, max_wait_ms=max_wait_ms, max_queue=clients * 4)
+    lat = StageMetrics(window=requests)
+
+    def client(i):
+        with lat.time("request"):
+            sched.predict(images[i % len(images)])
+
+    try:
+        sched.predict(images[0])  # 워밍업
+        t0 = time.perf_counter()
+        with ThreadPoolExecutor(clients) as ex:
+            list(ex.map(client, range(requests)))
+        total = time.perf_counter() - t0
+        s, ss = lat.summary()["request"], sched.stats()
+    finally:
+        sched.close()  # 백엔드마다 워커 스레드(와 모델)가 남지 않도록
+    row = {"bench": "scheduler", "case": f"{backend.name}/{clients}clients", "calls": requests, "items_per_call": 1,
+           "p50_ms": s["p50_ms"], "p95_ms": s["p95_ms"], "p99_ms": s["p99_ms"],
+           "items_per_s": requests / total, "batch_size_mean": ss["batch_size_mean"]}
+    results.append(row)
+    print(f"{'scheduler':<10} {row['case']:<34} p50 {row['p50_ms']:8.2f}ms  p95 {row['p95_ms']:8.2f}ms  "
+          f"p99 {row['p99_ms']:8.2f}ms  {row['items_per_s']:8.1f} items/s  (평균 배치 {ss['batch_size_mean']:.1f})")
+
+def main(argv=None):
+    p = argparse.ArgumentParser(description="오프라인 추론 벤치마크 (Streamlit·네트워크 불필요)")
+    p.add_argument("--arch", default="tiny", choices=["tiny", "resnet18", "resnet34"])
+    p.add_argument("--size", type=int, default=224, help="모델 입력 크기 (Resize)")
+    p.add_argument("--classes", type=int, default=3)
+    p.add_argument("--backends", default="learner,torchscript")
+    p.add_argument("--batch-sizes", default="8,32")
+    p.add_argument("--repeats", type=int, default=20)
+    p.add_argument("--clients", type=int, default=8, help="스케줄러 동시 요청 스레드 수 (0이면 생략)")
+    p.add_argument("--threads", type=int, default=0, help="torch.set_num_threads (0이면 기본값)")
+    p.add_argument("--skip-decode", action="store_true")
+    p.add_argument("--jsonl", help="결과를 JSONL로 저장할 경로")
+    args = p.parse_args(argv)
+
+    import torch
+    if args.threads:
+        torch.set_num_threads(args.threads)
+    print(f"python {sys.version.split()[0]} · torch {torch.__version__} · threads {torch.get_num_threads()}")
+
+    results: list[dict] = []
+    if not args.skip_decode:
+        bench_decode(results, args.size, args.repeats)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        learner = build_standin_learner(tmp, args.arch, args.classes, args.size)
+        images = [load_pil_from_bytes(encode(synthetic_image(w, h, seed=i), "JPEG"), args.size)
+                  for i, (w, h) in enumerate(RESOLUTIONS.values())]
+        batch_sizes = [int(x) for x in args.batch_sizes.split(",") if x]
+        for name in args.backends.split(","):
+            backend = build_backend(learner, name.strip())
+            bench_inference(results, backend, images, batch_sizes, args.repeats)
+            if args.clients:
+                bench_scheduler(results, backend, images, args.clients, args.repeats * args.clients,
+                                max(batch_sizes or [16]), 10.0)
+
+    if args.jsonl:
+        with open(args.jsonl, "a") as fh:
+            for row in results:
+                fh.write(json.dumps({"arch": args.arch, "size": args.size, **row}) + "\n")
+    return results
+
+if __name__ == "__main__":
+    main()
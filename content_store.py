@@ -0,0 +1,102 @@
+# content_store.py
+# 라벨별 콘텐츠(텍스트/이미지/동영상) 저장소: 외부 매니페스트(JSON/YAML) + 에셋 디렉터리
+#
+# 매니페스트 형식:
+#   {"thumb_side": 360,
+#    "labels": {"<learner.dls.vocab 라벨명>": {"texts": [...], "images": [...], "videos": [...]}}}
+# 라벨명 대신 "#0", "#1" 처럼 vocab 인덱스로도 쓸 수 있다 (라벨명이 우선).
+# texts는 일반 텍스트로 취급해 HTML 이스케이프 후 표시한다 (HTML 태그 사용 불가).
+# images 항목은 http(s) URL, 매니페스트 기준 상대 경로, data: URI 중 하나.
+# 로컬/data: 이미지는 로드할 때 한 번만 썸네일로 줄이고 재압축해 메모리에 보관한다.
+
+import base64, json, os
+from dataclasses import dataclass, field
+from io import BytesIO
+from PIL import Image, ImageOps
+
+MAX_ITEMS = 3
+
+@dataclass
+class Thumb:
+    data: bytes           # 줄인 이미지 바이트 (st.image로 그대로 보냄)
+
+@dataclass
+class LabelContent:
+    texts: list[str] = field(default_factory=list)
+    images: list["str | Thumb"] = field(default_factory=list)   # 원격 URL은 그대로, 로컬은 Thumb
+    videos: list[str] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.texts or self.images or self.videos)
+
+def _read_manifest(path: str) -> dict:
+    with open(path, encoding="utf-8") as fh:
+        if path.endswith((".yaml", ".yml")):
+            import yaml  # 선택 의존성: YAML 매니페스트를 쓸 때만 필요
+            return yaml.safe_load(fh) or {}
+        return json.load(fh)
+
+def make_thumb(raw: bytes, side: int) -> tuple[bytes, str]:
+    """side 이하로 줄이고 재압축. 팔레트/투명 이미지는 PNG, 그 외는 JPEG.
+    줄일 필요가 없고 재압축해도 작아지지 않으면 원본 바이트를 그대로 쓴다."""
+    src = Image.open(BytesIO(raw))
+    orig_mime = Image.MIME.get(src.format or "", "application/octet-stream")
+    rotated = src.getexif().get(0x0112, 1) != 1
+    img = ImageOps.exif_transpose(src)
+    resized = max(img.size) > side
+    img.thumbnail((side, side))
+    buf = BytesIO()
+    if img.mode in ("RGBA", "LA", "P", "PA", "1"):
+        img.save(buf, format="PNG", optimize=True)
+        data, mime = buf.getvalue(), "image/png"
+    else:
+        img.convert("RGB").save(buf, format="JPEG", quality=82, optimize=True)
+        data, mime = buf.getvalue(), "image/jpeg"
+    if not resized and not rotated and len(data) >= len(raw):
+        return raw, orig_mime
+    return data, mime
+
+def _pick(lst) -> list[str]:
+    return [x for x in (lst or []) if isinstance(x, str) and x.strip()][:MAX_ITEMS]
+
+class LabelContentStore:
+    def __init__(self, manifest_path: str, thumb_side: int | None = None):
+        self.manifest_path = manifest_path
+        self.base_dir = os.path.dirname(os.path.abspath(manifest_path))
+        manifest = _read_manifest(manifest_path)
+        self.thumb_side = int(thumb_side or manifest.get("thumb_side", 360))
+        self._thumbs: dict[str, Thumb] = {}
+        self._by_key: dict[str, LabelContent] = {
+            str(key): LabelContent(
+                texts=_pick(cfg.get("texts")),
+                images=[self._image_ref(x) for x in _pick(cfg.get("images"))],
+                videos=_pick(cfg.get("videos")),
+            )
+            for key, cfg in (manifest.get("labels") or {}).items()
+        }
+
+    def _image_ref(self, ref: str) -> "str | Thumb":
+        if ref.startswith(("http://", "https://")):
+            return ref
+        if ref in self._thumbs:
+            return self._thumbs[ref]
+        if ref.startswith("data:"):
+            raw = base64.b64decode(ref.split(",", 1)[1])
+        else:
+            with open(os.path.join(self.base_dir, ref), "rb") as fh:
+                raw = fh.read()
+        data, _ = make_thumb(raw, self.thumb_side)
+        self._thumbs[ref] = Thumb(data)
+        return self._thumbs[ref]
+
+    def get(self, label: str, labels: list[str]) -> LabelContent:
+        """라벨명 → 콘텐츠. 라벨명 키가 없으면 "#<vocab 인덱스>" 키를 찾음."""
+        if label in self._by_key:
+            return self._by_key[label]
+        if label in labels:
+            return self._by_key.get(f"#{labels.index(label)}", LabelContent())
+        return LabelContent()
+
+    def stats(self) -> dict:
+        return {"labels": len(self._by_key), "thumbs": len(self._thumbs),
+                "thumb_bytes": sum(len(t.data) for t in self._thumbs.values())}
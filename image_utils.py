@@ -0,0 +1,60 @@
+# image_utils.py
+# 업로드 이미지 디코딩/전처리. Streamlit·fastai 없이 import 가능 (벤치마크 등에서 재사용)
+
+from io import BytesIO
+from PIL import Image
+
+PREVIEW_SIDE = 640
+_REDUCE_MODES = ("RGB", "RGBA", "L", "LA")
+
+# EXIF Orientation 값 → transpose 방법 (ImageOps.exif_transpose 와 같은 표)
+_EXIF_ORIENTATION = 0x0112
+_TRANSPOSE_BY_ORIENTATION = {
+    2: Image.FLIP_LEFT_RIGHT,
+    3: Image.ROTATE_180,
+    4: Image.FLIP_TOP_BOTTOM,
+    5: Image.TRANSPOSE,
+    6: Image.ROTATE_270,
+    7: Image.TRANSVERSE,
+    8: Image.ROTATE_90,
+}
+
+def load_pil_from_bytes(b: bytes, min_side: int | None = None) -> Image.Image:
+    """바이트 → RGB PIL 이미지 (EXIF 회전 적용).
+
+    min_side를 주면 짧은 변이 min_side 이상인 가장 작은 해상도로 디코딩한다.
+    JPEG는 draft(DCT 스케일링)로 1/2~1/8 크기로 바로 디코딩하고, 남은 배율은 정수배 reduce.
+    회전/RGB 변환은 줄인 뒤에 하므로 원본 크기 복사본이 생기지 않는다.
+    """
+    pil = Image.open(BytesIO(b))
+    orientation = pil.getexif().get(_EXIF_ORIENTATION, 1)
+    if min_side:
+        if pil.format == "JPEG":
+            pil.draft("RGB", (min_side, min_side))
+        factor = min(pil.size) // min_side
+        if factor >= 2:
+            # reduce()는 P, 1, I;16 등을 지원하지 않으므로 먼저 RGB로 (어차피 마지막에 RGB가 됨)
+            if pil.mode not in _REDUCE_MODES: pil = pil.convert("RGB")
+            pil = pil.reduce(factor)
+    if orientation in _TRANSPOSE_BY_ORIENTATION:
+        pil = pil.transpose(_TRANSPOSE_BY_ORIENTATION[orientation])
+    if pil.mode != "RGB": pil = pil.convert("RGB")
+    return pil
+
+def preview_jpeg(b: bytes, side: int = PREVIEW_SIDE, quality: int = 85) -> bytes:
+    """st.image 미리보기용 축소 JPEG. 모델 입력과는 별도로 만든다."""
+    pil = load_pil_from_bytes(b, side)
+    pil.thumbnail((side, side))
+    buf = BytesIO()
+    pil.save(buf, format="JPEG", quality=quality)
+    return buf.getvalue()
+
+def model_input_size(learner, default: int = 224) -> int:
+    """learner의 item/batch 변환(Resize, RandomResizedCrop 등)에서 가장 큰 size를 찾음."""
+    sizes = []
+    for pipe in (learner.dls.after_item, learner.dls.after_batch):
+        for t in getattr(pipe, "fs", []):
+            size = getattr(t, "size", None)
+            if size is None: continue
+            sizes.extend(size if isinstance(size, (tuple, list)) else [size])
+    return int(max(sizes)) if sizes else default
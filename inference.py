@@ -0,0 +1,194 @@
+# inference.py
+# 추론 백엔드: fastai Learner 그대로 쓰기 / TorchScript(+선택적 int8 동적 양자화)로 내보내 쓰기
+#
+# TorchScript 모듈에 들어가는 것은 정규화(Normalize) + 모델 + softmax 뿐이다.
+# Resize는 모듈 밖에서 PIL로 fastai와 같게 재현하며 crop/squish만 지원한다 (pad는 learner 백엔드로 대체).
+#
+# 내보내기 (CLI):
+#   python inference.py export model.pkl model.ts [--quantize]
+
+import json
+import numpy as np
+import torch
+from torch import nn
+from PIL import Image
+
+BACKENDS = ("learner", "torchscript", "torchscript-int8")
+
+# ======================
+# fastai 변환 → 일반 파라미터
+# ======================
+def resize_spec(learner) -> tuple[tuple[int, int], str]:
+    """after_item의 Resize에서 ((w, h), method) 추출. fastai는 size를 (w, h)로 저장한다."""
+    for t in learner.dls.after_item.fs:
+        if type(t).__name__ == "Resize":
+            w, h = (int(s) for s in t.size)
+            return (w, h), str(t.method)
+    raise ValueError("after_item에 Resize 변환이 없어 TorchScript 백엔드를 만들 수 없습니다.")
+
+def normalize_spec(learner) -> tuple[list[float], list[float]]:
+    """after_batch의 Normalize에서 (mean, std) 추출. 없으면 항등."""
+    for t in learner.dls.after_batch.fs:
+        if type(t).__name__ == "Normalize":
+            return t.mean.flatten().tolist(), t.std.flatten().tolist()
+    return [0.0, 0.0, 0.0], [1.0, 1.0, 1.0]
+
+def resize_like_fastai(img: Image.Image, size: tuple[int, int], method: str) -> Image.Image:
+    """검증 모드 fastai Resize와 같은 결과: crop은 가운데 자르기, squish는 비율 무시."""
+    tw, th = size
+    if method == "squish":
+        return img.resize((tw, th), Image.BILINEAR)
+    if method != "crop":
+        raise ValueError(f"지원하지 않는 Resize method: {method}")
+    w, h = img.size
+    m = min(w / tw, h / th)
+    cw, ch = int(m * tw), int(m * th)
+    left, top = int(0.5 * (w - cw)), int(0.5 * (h - ch))
+    return img.crop((left, top, left + cw, top + ch)).resize((tw, th), Image.BILINEAR)
+
+class _InferenceModule(nn.Module):
+    """uint8 NHWC 배치(이미 Resize 된) → 정규화 → 모델 → softmax 확률. 통째로 trace 된다."""
+
+    def __init__(self, model: nn.Module, mean: list[float], std: list[float]):
+        super().__init__()
+        self.model = model
+        self.register_buffer("mean", torch.tensor(mean).view(1, -1, 1, 1))
+        self.register_buffer("std", torch.tensor(std).view(1, -1, 1, 1))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        x = x.permute(0, 3, 1, 2).float().div(255.0)
+        x = (x - self.mean) / self.std
+        return torch.softmax(self.model(x), dim=1)
+
+# ======================
+# 백엔드
+# ======================
+class LearnerBackend:
+    """기존 경로: test_dl → get_preds."""
+
+    name = "learner"
+
+    def __init__(self, learner):
+        self.learner = learner
+        self.vocab = [str(x) for x in learner.dls.vocab]
+
+    def predict_probs(self, images: list[Image.Image]) -> np.ndarray:
+        from fastai.vision.core import PILImage
+        dl = self.learner.dls.test_dl([PILImage(img) for img in images], bs=max(len(images), 1))
+        with self.learner.no_bar():
+            probs, _ = self.learner.get_preds(dl=dl)
+        return probs.numpy()
+
+class TorchScriptBackend:
+    """trace 된 정규화+모델 모듈 + PIL Resize. fastai 없이도 load 가능."""
+
+    def __init__(self, module: torch.jit.ScriptModule, meta: dict):
+        self.module = module
+        self.meta = meta
+        self.name = meta["backend"]
+        self.vocab = meta["vocab"]
+        self.size = tuple(meta["size"])
+        self.method = meta["method"]
+
+    @classmethod
+    def from_learner(cls, learner, quantize: bool = False) -> "TorchScriptBackend":
+        size, method = resize_spec(learner)
+        resize_like_fastai(Image.new("RGB", size), size, method)  # 지원하지 않는 method면 여기서 실패
+        mean, std = normalize_spec(learner)
+        model = learner.model.eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+        wrapped = _InferenceModule(model, mean, std).eval()
+        example = torch.zeros(1, size[1], size[0], 3, dtype=torch.uint8)
+        with torch.no_grad():
+            traced = torch.jit.freeze(torch.jit.trace(wrapped, example))
+        meta = {
+            "backend": "torchscript-int8" if quantize else "torchscript",
+            "vocab": [str(x) for x in learner.dls.vocab],
+            "size": list(size),
+            "method": method,
+        }
+        return cls(traced, meta)
+
+    @classmethod
+    def load(cls, path: str) -> "TorchScriptBackend":
+        extra = {"meta.json": ""}
+        module = torch.jit.load(path, map_location="cpu", _extra_files=extra)
+        return cls(module.eval(), json.loads(extra["meta.json"]))
+
+    def save(self, path: str):
+        torch.jit.save(self.module, path, _extra_files={"meta.json": json.dumps(self.meta, ensure_ascii=False)})
+
+    def predict_probs(self, images: list[Image.Image]) -> np.ndarray:
+        batch = np.stack([np.asarray(resize_like_fastai(img, self.size, self.method)) for img in images])
+        with torch.inference_mode():
+            return self.module(torch.from_numpy(batch)).numpy()
+
+def build_backend(learner, name: str = "learner"):
+    if name == "learner":
+        return LearnerBackend(learner)
+    if name in ("torchscript", "torchscript-int8"):
+        return TorchScriptBackend.from_learner(learner, quantize=name.endswith("int8"))
+    raise ValueError(f"알 수 없는 백엔드: {name} (가능: {', '.join(BACKENDS)})")
+
+# ======================
+# 정합성 검사
+# ======================
+PARITY_ATOL = {"learner": 0.0, "torchscript": 1e-3, "torchscript-int8": 5e-2}
+
+def sample_images(n: int = 12, seed: int = 0) -> list[Image.Image]:
+    """정합성 검사용 합성 이미지. 노이즈만이 아니라 그라디언트·색 블록 같은 구조가 있는 이미지도 섞고
+    가로/세로/정사각 비율을 돌려 쓴다."""
+    rng = np.random.default_rng(seed)
+    shapes = [(480, 640), (640, 480), (300, 300), (720, 1280)]
+    out = []
+    for i in range(n):
+        h, w = shapes[i % len(shapes)]
+        kind = i % 3
+        if kind == 0:
+            arr = rng.integers(0, 256, (h, w, 3), dtype=np.uint8)
+        elif kind == 1:
+            yy, xx = np.mgrid[0:h, 0:w]
+            c = rng.uniform(0, 255, (2, 3))
+            t = ((xx / w + yy / h) / 2)[..., None]
+            arr = (c[0] * (1 - t) + c[1] * t).astype(np.uint8)
+        else:
+            arr = np.empty((h, w, 3), dtype=np.uint8)
+            arr[:] = rng.integers(0, 256, 3)
+            for _ in range(6):
+                y, x = rng.integers(0, h // 2), rng.integers(0, w // 2)
+                arr[y:y + h // 3, x:x + w // 3] = rng.integers(0, 256, 3)
+        out.append(Image.fromarray(arr))
+    return out
+
+def check_parity(learner, backend, images: list[Image.Image] | None = None, atol: float | None = None):
+    """learner.predict 확률과 비교. 확률 오차가 atol 이하이고 모든 이미지의 top-1 라벨이 같아야 통과.
+    반환: (통과 여부, 최대 절대 오차, top-1 불일치 수)."""
+    from fastai.vision.core import PILImage
+    images = images or sample_images()
+    atol = PARITY_ATOL.get(backend.name, 1e-3) if atol is None else atol
+    ref = np.stack([learner.predict(PILImage(img.copy()))[2].numpy() for img in images])
+    got = backend.predict_probs(images)
+    max_diff = float(np.abs(ref - got).max())
+    flips = int((ref.argmax(axis=1) != got.argmax(axis=1)).sum())
+    return max_diff <= atol and flips == 0, max_diff, flips
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="model.pkl → TorchScript 추론 모듈 내보내기")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    ex = sub.add_parser("export")
+    ex.add_argument("model_pkl")
+    ex.add_argument("output")
+    ex.add_argument("--quantize", action="store_true", help="nn.Linear int8 동적 양자화")
+    args = parser.parse_args()
+
+    from fastai.learner import load_learner
+    learner = load_learner(args.model_pkl, cpu=True)
+    backend = TorchScriptBackend.from_learner(learner, quantize=args.quantize)
+    ok, diff, flips = check_parity(learner, backend)
+    print(f"parity: max |Δp| = {diff:.6f}, top-1 mismatches = {flips} ({'OK' if ok else 'FAIL'})")
+    if not ok:
+        raise SystemExit(1)
+    backend.save(args.output)
+    print(f"saved {backend.name} → {args.output}")
@@ -0,0 +1,79 @@
+# metrics.py
+# 단계별 지연 시간 기록 (decode / predict / render ...) + p50/p95/p99 요약 + Prometheus/JSONL 내보내기
+
+import json, os, threading, time
+from collections import deque
+from contextlib import contextmanager
+import numpy as np
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class StageMetrics:
+    """단계 이름별 최근 window개 지연(초)과 누적 count/sum. 여러 세션이 공유하므로 lock 사용."""
+
+    def __init__(self, window: int = 2048, prefix: str = "app"):
+        self.window = window
+        self.prefix = prefix
+        self._samples: dict[str, deque[float]] = {}
+        self._count: dict[str, int] = {}
+        self._sum: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def observe(self, stage: str, seconds: float):
+        with self._lock:
+            if stage not in self._samples:
+                self._samples[stage] = deque(maxlen=self.window)
+                self._count[stage], self._sum[stage] = 0, 0.0
+            self._samples[stage].append(seconds)
+            self._count[stage] += 1
+            self._sum[stage] += seconds
+
+    @contextmanager
+    def time(self, stage: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(stage, time.perf_counter() - t0)
+
+    def summary(self) -> dict[str, dict]:
+        """{stage: {count, mean_ms, p50_ms, p95_ms, p99_ms}} (분위수는 최근 window 기준)."""
+        return {stage: s for stage, (s, _) in self._summary_with_sums().items()}
+
+    def _summary_with_sums(self) -> dict[str, tuple[dict, float]]:
+        """summary와 누적 sum(초)을 같은 스냅숏에서 계산."""
+        with self._lock:
+            snap = {k: (np.array(v), self._count[k], self._sum[k]) for k, v in self._samples.items()}
+        out = {}
+        for stage, (arr, count, total) in snap.items():
+            qs = np.quantile(arr, QUANTILES) * 1000.0 if len(arr) else np.zeros(len(QUANTILES))
+            out[stage] = ({"count": count, "mean_ms": total / count * 1000.0 if count else 0.0,
+                           **{f"p{round(q * 100)}_ms": float(v) for q, v in zip(QUANTILES, qs)}}, total)
+        return out
+
+    # ---------- 내보내기 ----------
+    def prometheus(self) -> str:
+        """Prometheus text exposition (summary 타입)."""
+        name = f"{self.prefix}_stage_latency_seconds"
+        lines = [f"# HELP {name} Per-stage request latency.", f"# TYPE {name} summary"]
+        for stage, (s, total) in self._summary_with_sums().items():
+            for q in QUANTILES:
+                lines.append(f'{name}{{stage="{stage}",quantile="{q}"}} {s[f"p{round(q * 100)}_ms"] / 1000.0:.6f}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {total:.6f}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {s["count"]}')
+        return "\n".join(lines) + "\n"
+
+    def jsonl(self) -> str:
+        ts = time.time()
+        return "".join(json.dumps({"ts": ts, "stage": k, **v}) + "\n" for k, v in self.summary().items())
+
+    def write_prometheus(self, path: str):
+        """node_exporter textfile collector 용. 임시 파일에 쓰고 교체해 부분 읽기를 막음.
+        세션(스레드)들이 동시에 호출하므로 lock으로 직렬화하고 임시 파일 이름에 스레드 id도 넣는다."""
+        text = self.prometheus()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._write_lock:
+            with open(tmp, "w") as fh:
+                fh.write(text)
+            os.replace(tmp, path)
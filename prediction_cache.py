@@ -0,0 +1,108 @@
+# prediction_cache.py
+# 예측 캐시: (이미지 바이트 해시 + 모델 지문) → 확률. Streamlit 없이 import 가능
+
+import os, hashlib, threading
+from collections import OrderedDict
+import numpy as np
+
+class PredictionCache:
+    """메모리 LRU + (선택) 디스크 캐시. 모든 세션이 공유하므로 lock으로 보호.
+
+    디스크 층은 max_disk_items개를 넘으면 가장 오래 쓰이지 않은(mtime 기준) 파일부터 지운다.
+    디스크 적중 시 mtime을 갱신하므로 디스크 층도 LRU처럼 동작한다. max_disk_items=0이면 무제한.
+    """
+
+    def __init__(self, model_fp: str, max_items: int = 256, cache_dir: str | None = None,
+                 max_disk_items: int = 10000):
+        self.model_fp = model_fp
+        self.max_items = max_items
+        self.cache_dir = cache_dir or None
+        self.max_disk_items = max_disk_items
+        self.hits = self.disk_hits = self.misses = self.disk_evictions = 0
+        self._mem: OrderedDict[str, np.ndarray] = OrderedDict()
+        self._lock = threading.Lock()
+        self._disk_count = 0
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            self._disk_count = len(self._disk_files())
+            self._prune_disk()
+
+    def key(self, img_bytes: bytes) -> str:
+        return hashlib.sha256(self.model_fp.encode() + hashlib.sha256(img_bytes).digest()).hexdigest()
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def _disk_files(self) -> list[str]:
+        return [e.path for e in os.scandir(self.cache_dir) if e.is_file() and e.name.endswith(".npy")]
+
+    def get(self, key: str) -> np.ndarray | None:
+        with self._lock:
+            if key in self._mem:
+                self._mem.move_to_end(key)
+                self.hits += 1
+                return self._mem[key]
+        if self.cache_dir and os.path.exists(self._disk_path(key)):
+            try:
+                probs = np.load(self._disk_path(key))
+                os.utime(self._disk_path(key))
+            except (OSError, ValueError):
+                probs = None
+            if probs is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                self._remember(key, probs)
+                return probs
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, probs: np.ndarray):
+        probs = np.asarray(probs, dtype=np.float32)
+        self._remember(key, probs)
+        if self.cache_dir:
+            path = self._disk_path(key)
+            is_new = not os.path.exists(path)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as fh:
+                np.save(fh, probs)
+            os.replace(tmp, path)
+            if is_new:
+                with self._lock:
+                    self._disk_count += 1
+                self._prune_disk()
+
+    def _remember(self, key: str, probs: np.ndarray):
+        with self._lock:
+            self._mem[key] = probs
+            self._mem.move_to_end(key)
+            while len(self._mem) > self.max_items:
+                self._mem.popitem(last=False)
+
+    def _prune_disk(self):
+        """디스크 파일 수가 상한을 넘으면 오래된 것부터 상한의 90%까지 지운다 (매 put마다 목록을 읽지 않도록)."""
+        if not self.max_disk_items or self._disk_count <= self.max_disk_items:
+            return
+        with self._lock:
+            files = []
+            for path in self._disk_files():
+                try:
+                    files.append((os.path.getmtime(path), path))
+                except OSError:
+                    pass
+            files.sort()
+            excess = len(files) - int(self.max_disk_items * 0.9)
+            removed = 0
+            for _, path in files[:max(0, excess)]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except OSError:
+                    pass
+            self._disk_count = len(files) - removed
+            self.disk_evictions += removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "disk_hits": self.disk_hits, "misses": self.misses, "size": len(self._mem),
+                    "disk_size": self._disk_count, "disk_evictions": self.disk_evictions}
@@ -0,0 +1,165 @@
+# scheduler.py
+# 세션 간 동적 마이크로 배칭: 모든 세션의 요청을 큐 하나로 모아 단일 워커가 배치로 추론
+
+import logging, queue, threading, time
+from collections import deque
+from concurrent.futures import Future, InvalidStateError
+import numpy as np
+
+log = logging.getLogger("scheduler")
+
+class QueueFullError(RuntimeError):
+    """큐가 가득 차 요청을 받을 수 없음 (backpressure)."""
+
+class _Request:
+    """단일 이미지 요청 또는 bulk 작업(이미지 묶음을 그 크기 그대로 한 번에 추론)."""
+    __slots__ = ("images", "bulk", "future", "enqueued")
+
+    def __init__(self, images: list, bulk: bool = False):
+        self.images = images
+        self.bulk = bulk
+        self.future: Future = Future()
+        self.enqueued = time.perf_counter()
+
+class BatchScheduler:
+    """backend.predict_probs를 소유하는 단일 워커 스레드.
+
+    요청이 오면 max_batch_size가 찰 때까지 또는 첫 요청 후 max_wait_ms가 지날 때까지 모아
+    한 번에 추론하고, 결과는 요청별 Future로 돌려준다. 모델을 한 스레드만 쓰므로
+    세션마다 PyTorch intra-op 스레드가 겹쳐 코어를 과점유하는 일이 없다.
+
+    일괄 분류처럼 이미 묶인 이미지는 predict_probs로 bulk 작업 하나(큐 한 칸)로 제출되어
+    요청한 배치 크기 그대로 단독 추론된다. 그래서 대량 작업이 큐를 채워 다른 세션의
+    단일 요청이 거절되는 일이 없다.
+
+    배치 처리 중 어떤 예외가 나도 아직 끝나지 않은 Future에 예외를 넣고 워커는 계속 돈다.
+    다 쓴 스케줄러는 close()로 워커를 멈춘다 (백엔드 참조도 함께 놓아 준다).
+    """
+
+    def __init__(self, backend, max_batch_size: int = 16, max_wait_ms: float = 10.0,
+                 max_queue: int = 256, num_threads: int | None = None, window: int = 1000):
+        self.backend = backend
+        self.vocab = backend.vocab
+        self.name = backend.name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.num_threads = num_threads
+        self._queue: queue.Queue[_Request] = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._waits: deque[float] = deque(maxlen=window)
+        self._batch_sizes: deque[int] = deque(maxlen=window)
+        self.requests = self.batches = self.rejected = 0
+        self._closed = False
+        self._worker = threading.Thread(target=self._run, name="inference-worker", daemon=True)
+        self._worker.start()
+
+    # ---------- 제출 ----------
+    def submit(self, image, timeout: float | None = 0.0) -> Future:
+        """단일 요청을 큐에 넣고 Future 반환. timeout 안에 자리가 안 나면 QueueFullError."""
+        return self._enqueue(_Request([image]), timeout)
+
+    def _enqueue(self, req: _Request, timeout: float | None) -> Future:
+        if self._closed:
+            raise RuntimeError("스케줄러가 닫혔습니다")
+        try:
+            if timeout == 0.0:
+                self._queue.put_nowait(req)
+            else:
+                self._queue.put(req, timeout=timeout)
+        except queue.Full:
+            with self._lock:
+                self.rejected += 1
+            raise QueueFullError(f"추론 큐가 가득 찼습니다 ({self._queue.maxsize}개 대기 중)") from None
+        return req.future
+
+    def predict(self, image, timeout: float | None = None) -> np.ndarray:
+        """timeout 안에 결과가 없으면 concurrent.futures.TimeoutError."""
+        return self.submit(image).result(timeout)
+
+    def predict_probs(self, images, submit_timeout: float | None = None,
+                      timeout: float | None = None) -> np.ndarray:
+        """백엔드와 같은 인터페이스. 이미지 묶음을 bulk 작업 하나로 제출해 len(images) 크기로 추론."""
+        if not images:
+            return np.empty((0, len(self.vocab)), dtype=np.float32)
+        return self._enqueue(_Request(list(images), bulk=True), submit_timeout).result(timeout)
+
+    def close(self, timeout: float | None = 5.0):
+        """새 요청을 막고, 이미 받은 요청을 처리한 뒤 워커를 멈춘다."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._worker.join(timeout)
+        self.backend = None
+
+    # ---------- 워커 ----------
+    def _run(self):
+        if self.num_threads:
+            import torch
+            torch.set_num_threads(self.num_threads)
+        pending: _Request | None = None
+        stopping = False
+        while not stopping or pending is not None:
+            first, pending = pending or self._queue.get(), None
+            if first is None:  # close()
+                break
+            if first.bulk:
+                self._process([first])
+                continue
+            batch = [first]
+            deadline = time.perf_counter() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - time.perf_counter()
+                try:
+                    req = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if req is None:
+                    stopping = True
+                    break
+                if req.bulk:  # bulk 작업은 섞지 않고 다음 차례에 단독 실행
+                    pending = req
+                    break
+                batch.append(req)
+            self._process(batch)
+
+    def _process(self, batch: list[_Request]):
+        try:
+            self._process_batch(batch)
+        except Exception as e:
+            # 결과 분배 중 오류(백엔드가 행 수를 잘못 돌려준 경우 등)로 워커가 죽지 않도록
+            log.exception("batch failed (%d requests)", len(batch))
+            for r in batch:
+                try:
+                    r.future.set_exception(e)
+                except InvalidStateError:
+                    pass
+
+    def _process_batch(self, batch: list[_Request]):
+        started = time.perf_counter()
+        images = [img for r in batch for img in r.images]
+        with self._lock:
+            self.requests += len(batch)
+            self.batches += 1
+            self._batch_sizes.append(len(images))
+            self._waits.extend(started - r.enqueued for r in batch)
+        probs = self.backend.predict_probs(images)
+        if len(probs) != len(images):
+            raise RuntimeError(f"백엔드가 {len(images)}장에 대해 {len(probs)}개 결과를 돌려줬습니다")
+        start = 0
+        for r in batch:
+            n = len(r.images)
+            r.future.set_result(probs[start:start + n] if r.bulk else probs[start])
+            start += n
+
+    # ---------- 지표 ----------
+    def stats(self) -> dict:
+        with self._lock:
+            waits = np.array(self._waits) * 1000.0
+            sizes = np.array(self._batch_sizes)
+            out = {"requests": self.requests, "batches": self.batches, "rejected": self.rejected,
+                   "queue_depth": self._queue.qsize()}
+        out["wait_ms_p50"], out["wait_ms_p95"] = (np.percentile(waits, [50, 95]).tolist() if len(waits) else (0.0, 0.0))
+        out["batch_size_mean"] = float(sizes.mean()) if len(sizes) else 0.0
+        out["batch_size_max"] = int(sizes.max()) if len(sizes) else 0
+        return out
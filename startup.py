@@ -0,0 +1,145 @@
+# startup.py
+# 콜드 스타트 파이프라인: 모델 파일 확인(체크섬) → 무거운 import → 언피클 → 백엔드 → 워밍업
+# 전부 백그라운드 스레드에서 돌리고, 페이지는 그동안 업로드 UI를 먼저 그린다.
+
+import hashlib, json, logging, os, threading, time
+from concurrent.futures import Future
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+log = logging.getLogger("startup")
+
+@dataclass
+class ModelBundle:
+    learner: object
+    backend: object
+    fingerprint: str          # 모델 파일 sha256 (예측 캐시 키에 사용)
+    labels: list[str]
+    input_side: int
+    backend_warning: str | None = None
+    timings: dict[str, float] = field(default_factory=dict)
+
+class PhaseTimer:
+    """단계별 소요 시간 기록 + 로그."""
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+
+    @contextmanager
+    def __call__(self, phase: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.timings[phase] = time.perf_counter() - t0
+            log.info("startup phase %-8s %.3fs", phase, self.timings[phase])
+
+# ======================
+# 로컬 모델 캐시 (체크섬 검증)
+# ======================
+def file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def cached_sha256(path: str) -> str:
+    """파일 옆 .sha256 사이드카(크기·mtime 기록)가 맞으면 재해시 없이 재사용."""
+    stat = os.stat(path)
+    sidecar = f"{path}.sha256"
+    try:
+        with open(sidecar) as fh:
+            meta = json.load(fh)
+        if meta["size"] == stat.st_size and meta["mtime_ns"] == stat.st_mtime_ns:
+            return meta["sha256"]
+    except (OSError, ValueError, KeyError):
+        pass
+    digest = file_sha256(path)
+    try:
+        with open(sidecar, "w") as fh:
+            json.dump({"sha256": digest, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}, fh)
+    except OSError:
+        pass  # 읽기 전용 디렉터리여도 동작은 해야 함
+    return digest
+
+def resolve_model(model_path: str, file_id: str, expected_sha256: str = "") -> str:
+    """model_path에 검증된 파일이 있으면 그대로 사용(네트워크 없음).
+    없거나 체크섬이 다르면 Google Drive에서 임시 파일로 받아 검증 후 교체. 반환: sha256."""
+    expected = expected_sha256.strip().lower()
+    if os.path.exists(model_path):
+        digest = cached_sha256(model_path)
+        if not expected or digest == expected:
+            return digest
+        log.warning("model checksum mismatch (%s != %s), re-downloading", digest, expected)
+
+    import gdown
+    os.makedirs(os.path.dirname(os.path.abspath(model_path)), exist_ok=True)
+    tmp = f"{model_path}.{os.getpid()}.part"
+    try:
+        gdown.download(f"https://drive.google.com/uc?id={file_id}", tmp, quiet=False)
+        digest = file_sha256(tmp)
+        if expected and digest != expected:
+            raise RuntimeError(f"다운로드한 모델 체크섬 불일치: {digest} != {expected}")
+        os.replace(tmp, model_path)
+    finally:
+        if os.path.exists(tmp): os.remove(tmp)
+    cached_sha256(model_path)  # 사이드카 기록
+    return digest
+
+# ======================
+# 로드 + 워밍업
+# ======================
+def load_bundle(file_id: str, model_path: str, expected_sha256: str = "",
+                backend_name: str = "learner", ts_path: str = "") -> ModelBundle:
+    timer = PhaseTimer()
+    t0 = time.perf_counter()
+    with timer("resolve"):
+        fingerprint = resolve_model(model_path, file_id, expected_sha256)
+    with timer("import"):
+        import fastai.vision.all  # noqa: F401  (언피클에 필요한 fastai 패치/클래스 등록)
+        from fastai.learner import load_learner
+        from PIL import Image
+        from image_utils import model_input_size
+        from inference import LearnerBackend, TorchScriptBackend, build_backend, check_parity
+    with timer("unpickle"):
+        learner = load_learner(model_path, cpu=True)
+    with timer("backend"):
+        backend, warning = LearnerBackend(learner), None
+        if backend_name != "learner":
+            try:
+                candidate = TorchScriptBackend.load(ts_path) if ts_path else build_backend(learner, backend_name)
+                ok, diff, flips = check_parity(learner, candidate)
+                if ok:
+                    backend = candidate
+                else:
+                    warning = f"{backend_name} 백엔드 정합성 검사 실패 (max |Δp| = {diff:.4f}, top-1 불일치 {flips}장)"
+            except Exception as e:
+                warning = f"{backend_name} 백엔드 생성 실패: {e}"
+    side = model_input_size(learner)
+    with timer("warmup"):
+        # 첫 요청이 PyTorch 지연 초기화/TorchScript 최적화 비용을 내지 않도록 더미 배치 2회
+        dummy = [Image.new("RGB", (side, side)) for _ in range(2)]
+        for _ in range(2):
+            backend.predict_probs(dummy)
+    log.info("startup total %.3fs (%s)", time.perf_counter() - t0,
+             ", ".join(f"{k}={v:.2f}s" for k, v in timer.timings.items()))
+    return ModelBundle(
+        learner=learner, backend=backend, fingerprint=fingerprint,
+        labels=[str(x) for x in learner.dls.vocab], input_side=side,
+        backend_warning=warning, timings=timer.timings,
+    )
+
+def start_background_load(*args, **kwargs) -> Future:
+    """load_bundle을 데몬 스레드에서 실행하고 Future를 바로 반환."""
+    fut: Future = Future()
+
+    def run():
+        try:
+            fut.set_result(load_bundle(*args, **kwargs))
+        except BaseException as e:
+            log.exception("model startup failed")
+            fut.set_exception(e)
+
+    threading.Thread(target=run, name="model-loader", daemon=True).start()
+    return fut
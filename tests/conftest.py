@@ -0,0 +1,5 @@
+import os
+import sys
+
+# 저장소 루트의 모듈(image_utils, scheduler, ...)을 `pytest`만으로도 import 할 수 있도록
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,31 @@
+import os
+from io import BytesIO
+
+from PIL import Image
+
+from content_store import LabelContentStore, Thumb, make_thumb
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MANIFEST = os.path.join(ROOT, "content", "manifest.json")
+
+
+def test_shipped_thumbs_not_larger_than_assets():
+    store = LabelContentStore(MANIFEST)
+    for ref, thumb in store._thumbs.items():
+        with open(os.path.join(store.base_dir, ref), "rb") as fh:
+            assert len(thumb.data) <= len(fh.read())
+
+
+def test_palette_image_stays_png():
+    buf = BytesIO()
+    Image.new("P", (800, 600)).save(buf, format="PNG")
+    data, mime = make_thumb(buf.getvalue(), 360)
+    assert mime == "image/png"
+    assert max(Image.open(BytesIO(data)).size) == 360
+
+
+def test_lookup_by_label_then_index():
+    store = LabelContentStore(MANIFEST)
+    content = store.get("sad", ["happy", "sad", "angry"])
+    assert content.texts and isinstance(content.images[0], Thumb)
+    assert not store.get("unknown", ["happy"])
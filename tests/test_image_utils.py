@@ -0,0 +1,29 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from image_utils import load_pil_from_bytes
+
+
+def _png(mode: str, size=(1400, 900)) -> bytes:
+    buf = BytesIO()
+    Image.new(mode, size).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("mode", ["P", "1", "I;16"])
+def test_reduce_handles_unsupported_modes(mode):
+    img = load_pil_from_bytes(_png(mode), min_side=224)
+    assert img.mode == "RGB"
+    assert 224 <= min(img.size) < 450
+
+
+def test_exif_orientation_applied_after_reduce():
+    src = Image.new("RGB", (1600, 900))
+    exif = src.getexif()
+    exif[0x0112] = 6  # 90° 회전
+    buf = BytesIO()
+    src.save(buf, format="JPEG", exif=exif)
+    img = load_pil_from_bytes(buf.getvalue(), min_side=224)
+    assert img.size[0] < img.size[1]
@@ -0,0 +1,73 @@
+import json
+import threading
+
+import pytest
+
+from metrics import StageMetrics
+
+
+def make_metrics():
+    m = StageMetrics(window=100, prefix="t")
+    for ms in range(1, 101):
+        m.observe("decode", ms / 1000.0)
+    m.observe("predict", 0.25)
+    return m
+
+
+def test_summary_quantile_keys_and_values():
+    s = make_metrics().summary()
+    assert set(s) == {"decode", "predict"}
+    assert set(s["decode"]) == {"count", "mean_ms", "p50_ms", "p95_ms", "p99_ms"}
+    assert s["decode"]["count"] == 100
+    assert s["decode"]["mean_ms"] == pytest.approx(50.5)
+    assert s["decode"]["p50_ms"] == pytest.approx(50.5)
+    assert s["decode"]["p99_ms"] == pytest.approx(99.01)
+    assert s["predict"]["p95_ms"] == pytest.approx(250.0)
+
+
+def test_window_limits_quantiles_but_not_count_or_sum():
+    m = StageMetrics(window=2)
+    for sec in (10.0, 0.001, 0.001):
+        m.observe("x", sec)
+    s = m.summary()["x"]
+    assert s["count"] == 3 and s["p99_ms"] == pytest.approx(1.0)
+    assert s["mean_ms"] == pytest.approx(10002.0 / 3)
+
+
+def test_prometheus_exposition_format():
+    lines = make_metrics().prometheus().splitlines()
+    assert lines[0] == "# HELP t_stage_latency_seconds Per-stage request latency."
+    assert lines[1] == "# TYPE t_stage_latency_seconds summary"
+    assert 't_stage_latency_seconds{stage="decode",quantile="0.5"} 0.050500' in lines
+    assert 't_stage_latency_seconds_sum{stage="decode"} 5.050000' in lines
+    assert 't_stage_latency_seconds_count{stage="decode"} 100' in lines
+    assert 't_stage_latency_seconds_count{stage="predict"} 1' in lines
+    assert len(lines) == 2 + 2 * 5
+
+
+def test_jsonl_one_record_per_stage():
+    records = [json.loads(line) for line in make_metrics().jsonl().splitlines()]
+    assert {r["stage"] for r in records} == {"decode", "predict"}
+    assert all({"ts", "count", "p50_ms"} <= set(r) for r in records)
+
+
+def test_concurrent_write_prometheus(tmp_path):
+    m = make_metrics()
+    path = tmp_path / "app.prom"
+    errors = []
+
+    def writer():
+        for _ in range(50):
+            try:
+                m.write_prometheus(str(path))
+            except OSError as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert path.read_text() == m.prometheus()
+    assert [p.name for p in tmp_path.iterdir()] == ["app.prom"]
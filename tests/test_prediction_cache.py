@@ -0,0 +1,35 @@
+import os
+
+import numpy as np
+
+from prediction_cache import PredictionCache
+
+
+def test_memory_then_disk_hit(tmp_path):
+    cache = PredictionCache("fp", max_items=1, cache_dir=str(tmp_path))
+    a, b = cache.key(b"a"), cache.key(b"b")
+    cache.put(a, np.array([0.2, 0.8]))
+    cache.put(b, np.array([0.6, 0.4]))  # a는 메모리에서 밀려남
+    np.testing.assert_allclose(cache.get(b), [0.6, 0.4])
+    np.testing.assert_allclose(cache.get(a), [0.2, 0.8])
+    assert cache.stats()["hits"] == 1 and cache.stats()["disk_hits"] == 1
+
+
+def test_key_depends_on_model_fingerprint():
+    assert PredictionCache("fp1").key(b"x") != PredictionCache("fp2").key(b"x")
+
+
+def test_disk_layer_is_capped(tmp_path):
+    cache = PredictionCache("fp", max_items=1, cache_dir=str(tmp_path), max_disk_items=10)
+    keys = [cache.key(str(i).encode()) for i in range(25)]
+    for i, k in enumerate(keys):
+        cache.put(k, np.array([i, 0.0]))
+        os.utime(cache._disk_path(k), (i, i))  # mtime 순서를 확실히
+    files = [f for f in os.listdir(tmp_path) if f.endswith(".npy")]
+    assert len(files) <= 10
+    assert cache.stats()["disk_size"] == len(files)
+    assert os.path.exists(cache._disk_path(keys[-1]))
+    assert not os.path.exists(cache._disk_path(keys[0]))
+
+    reopened = PredictionCache("fp", cache_dir=str(tmp_path), max_disk_items=5)
+    assert len(os.listdir(tmp_path)) <= 5 and reopened.stats()["disk_size"] <= 5
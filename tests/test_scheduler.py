@@ -0,0 +1,68 @@
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from scheduler import BatchScheduler
+
+
+class FakeBackend:
+    name = "fake"
+    vocab = ["a", "b"]
+
+    def __init__(self):
+        self.sizes = []
+
+    def predict_probs(self, images):
+        self.sizes.append(len(images))
+        time.sleep(0.005)
+        return np.tile(np.array([[0.25, 0.75]], dtype=np.float32), (len(images), 1))
+
+
+def test_bulk_job_runs_at_its_own_batch_size():
+    backend = FakeBackend()
+    sched = BatchScheduler(backend, max_batch_size=4, max_queue=8)
+    probs = sched.predict_probs(list(range(32)))
+    assert probs.shape == (32, 2)
+    assert backend.sizes[-1] == 32
+
+
+def test_interactive_requests_not_rejected_during_bulk_job():
+    backend = FakeBackend()
+    sched = BatchScheduler(backend, max_batch_size=4, max_queue=8)
+
+    def job():
+        for _ in range(10):
+            sched.predict_probs(list(range(100)))
+
+    t = threading.Thread(target=job)
+    t.start()
+    time.sleep(0.01)
+    results = [sched.predict(i) for i in range(10)]
+    t.join()
+    assert sched.stats()["rejected"] == 0
+    assert all(r.shape == (2,) for r in results)
+
+
+class WrongRowsBackend(FakeBackend):
+    def predict_probs(self, images):
+        self.sizes.append(len(images))
+        return np.zeros((0, 2), dtype=np.float32) if len(self.sizes) == 1 else super().predict_probs(images)
+
+
+def test_worker_survives_bad_backend_output():
+    sched = BatchScheduler(WrongRowsBackend(), max_batch_size=4)
+    with pytest.raises(RuntimeError):
+        sched.predict(0, timeout=2)
+    assert sched.predict(1, timeout=2).shape == (2,)
+    sched.close()
+
+
+def test_close_stops_worker_and_rejects_new_requests():
+    sched = BatchScheduler(FakeBackend())
+    sched.predict(0, timeout=2)
+    sched.close()
+    assert not sched._worker.is_alive()
+    with pytest.raises(RuntimeError):
+        sched.submit(1)
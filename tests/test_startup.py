@@ -0,0 +1,78 @@
+import hashlib
+import json
+import os
+import sys
+import types
+
+import pytest
+
+from startup import cached_sha256, resolve_model
+
+GOOD, BAD = b"model-v2", b"truncated"
+
+
+def sha(b):
+    return hashlib.sha256(b).hexdigest()
+
+
+@pytest.fixture
+def downloads(monkeypatch):
+    """gdown.download를 가짜로 바꿔 호출 기록. payload를 바꾸면 다운로드 내용이 바뀐다."""
+    calls = []
+    state = {"payload": GOOD}
+
+    def download(url, output, quiet=False):
+        calls.append((url, output))
+        with open(output, "wb") as fh:
+            fh.write(state["payload"])
+        return output
+
+    monkeypatch.setitem(sys.modules, "gdown", types.SimpleNamespace(download=download))
+    return calls, state
+
+
+def test_prestaged_file_used_without_network(tmp_path, downloads):
+    calls, _ = downloads
+    path = tmp_path / "model.pkl"
+    path.write_bytes(GOOD)
+    assert resolve_model(str(path), "id", sha(GOOD)) == sha(GOOD)
+    assert resolve_model(str(path), "id") == sha(GOOD)
+    assert calls == []
+
+
+def test_sidecar_reused_until_size_or_mtime_changes(tmp_path):
+    path = tmp_path / "model.pkl"
+    path.write_bytes(GOOD)
+    assert cached_sha256(str(path)) == sha(GOOD)
+
+    sidecar = tmp_path / "model.pkl.sha256"
+    meta = json.loads(sidecar.read_text())
+    sidecar.write_text(json.dumps({**meta, "sha256": "cached"}))
+    assert cached_sha256(str(path)) == "cached"  # 크기·mtime이 같으면 재해시하지 않음
+
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cached_sha256(str(path)) == sha(GOOD)
+
+    path.write_bytes(BAD)
+    assert cached_sha256(str(path)) == sha(BAD)
+
+
+def test_checksum_mismatch_triggers_download(tmp_path, downloads):
+    calls, _ = downloads
+    path = tmp_path / "model.pkl"
+    path.write_bytes(BAD)
+    assert resolve_model(str(path), "abc", sha(GOOD)) == sha(GOOD)
+    assert len(calls) == 1 and calls[0][0].endswith("id=abc")
+    assert path.read_bytes() == GOOD
+    assert json.loads((tmp_path / "model.pkl.sha256").read_text())["sha256"] == sha(GOOD)
+
+
+def test_bad_download_raises_and_leaves_no_part_file(tmp_path, downloads):
+    _, state = downloads
+    state["payload"] = BAD
+    path = tmp_path / "models" / "model.pkl"
+    with pytest.raises(RuntimeError):
+        resolve_model(str(path), "id", sha(GOOD))
+    assert not path.exists()
+    assert not any(p.name.endswith(".part") for p in path.parent.iterdir())
@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+import video
+from video import merge_segments
+
+LABELS = ["a", "b"]
+A, B = [0.9, 0.1], [0.2, 0.8]
+
+
+def test_segments_are_contiguous_and_last_uses_tail():
+    segs = merge_segments([0.0, 0.5, 1.0, 1.5], np.array([A, A, B, B]), LABELS, smooth=1, tail=0.5)
+    assert [(s.label, s.start, s.end, s.frames) for s in segs] == [("a", 0.0, 1.0, 2), ("b", 1.0, 2.0, 2)]
+    assert segs[0].mean_prob == pytest.approx(0.9)
+    assert segs[1].mean_prob == pytest.approx(0.8)
+
+
+def test_variable_intervals_and_default_tail():
+    segs = merge_segments([0.0, 0.1, 0.4, 0.5], np.array([A, B, B, B]), LABELS, smooth=1)
+    assert [(s.start, s.end) for s in segs] == [(0.0, 0.1), (0.1, pytest.approx(0.6))]
+
+
+def test_single_sample_has_duration():
+    (seg,) = merge_segments([2.0], np.array([B]), LABELS, smooth=5, tail=0.25)
+    assert (seg.start, seg.end, seg.frames) == (2.0, 2.25, 1)
+
+
+def test_smoothing_suppresses_single_flicker():
+    probs = np.array([A, A, A, B, A, A])
+    segs = merge_segments(np.arange(6) * 0.5, probs, LABELS, smooth=3, tail=0.5)
+    assert [s.label for s in segs] == ["a"] and segs[0].end == 3.0
+    # 평활된 확률의 평균: 세 번째 이후 창에는 B가 하나 섞임
+    assert segs[0].mean_prob == pytest.approx(np.mean([0.9, 0.9, 0.9, 2.0 / 3, 2.0 / 3, 2.0 / 3]))
+
+
+class FakePredictor:
+    def __init__(self, probs):
+        self.probs, self.calls = list(probs), []
+
+    def predict_probs(self, images):
+        self.calls.append(len(images))
+        out, self.probs = self.probs[:len(images)], self.probs[len(images):]
+        return np.array(out)
+
+
+def test_classify_video_batches_and_counts_every_frame(monkeypatch):
+    def fake_iter(path, every_n, target_fps, min_side, res):
+        for idx in range(10):
+            res.frames_decoded += 1
+            if idx % 2 == 0:
+                yield idx, idx * 0.1, None
+
+    monkeypatch.setattr(video, "video_info", lambda path: (1000.0, -1))
+    monkeypatch.setattr(video, "iter_frames", fake_iter)
+    pred = FakePredictor([A, A, B, B, B])
+    progress = []
+    res = video.classify_video(pred, "x.webm", LABELS, every_n=2, bs=2, smooth=1,
+                               on_progress=lambda d, t: progress.append((d, t)))
+    assert pred.calls == [2, 2, 1]
+    assert (res.frames_decoded, res.frames_classified) == (10, 5)
+    assert [(s.label, s.start, s.end) for s in res.segments] == [
+        ("a", 0.0, pytest.approx(0.4)), ("b", pytest.approx(0.4), pytest.approx(1.0))]
+    assert progress[-1] == (10, -1)
@@ -0,0 +1,160 @@
+# video.py
+# 동영상 분류: 스트리밍 디코딩 → 프레임 샘플링 → 배치 추론 → 시간 평활 → 구간별 라벨
+# 프레임은 bs장씩만 메모리에 두므로 영상 길이와 상관없이 메모리 사용량이 일정하다.
+#
+# 시각은 CAP_PROP_FPS가 아니라 프레임마다 CAP_PROP_POS_MSEC로 읽는다. 가변 프레임레이트
+# 휴대폰 mp4나 브라우저 녹화 webm은 fps를 1000이나 0으로 보고하는 경우가 많기 때문.
+# cv2는 디코딩 함수 안에서만 import → 구간 병합(merge_segments)은 OpenCV 없이 테스트 가능.
+
+import time
+from dataclasses import dataclass, field
+import numpy as np
+from PIL import Image
+
+FALLBACK_FPS = 30.0   # POS_MSEC도 fps도 믿을 수 없을 때 쓰는 값
+MAX_SANE_FPS = 240.0  # 이보다 크거나 0 이하인 CAP_PROP_FPS는 무시
+
+@dataclass
+class Segment:
+    start: float          # 초
+    end: float
+    label: str
+    mean_prob: float
+    frames: int
+
+@dataclass
+class VideoResult:
+    segments: list[Segment] = field(default_factory=list)
+    frames_decoded: int = 0
+    frames_classified: int = 0
+    elapsed: float = 0.0
+    src_fps: float = 0.0
+
+    @property
+    def classified_fps(self) -> float:
+        return self.frames_classified / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def decoded_fps(self) -> float:
+        return self.frames_decoded / self.elapsed if self.elapsed else 0.0
+
+def _sane_fps(fps: float) -> float:
+    return fps if 0 < fps <= MAX_SANE_FPS else FALLBACK_FPS
+
+def _fit_min_side(frame: np.ndarray, min_side: int | None) -> np.ndarray:
+    import cv2
+    h, w = frame.shape[:2]
+    if not min_side or min(h, w) <= min_side:
+        return frame
+    scale = min_side / min(h, w)
+    return cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_AREA)
+
+def iter_frames(path: str, every_n: int | None = None, target_fps: float | None = None,
+                min_side: int | None = None, res: "VideoResult | None" = None):
+    """(프레임 번호, 시각(초), RGB PIL) 를 하나씩 생성.
+    every_n이면 N프레임마다, target_fps면 프레임 시각 기준으로 1/target_fps초마다 하나를 고른다.
+    샘플링하지 않는 프레임은 grab()만 해서 색 변환/복사 비용을 아낀다.
+    res를 주면 grab()한 모든 프레임 수를 res.frames_decoded에 센다."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        raise ValueError("동영상을 열 수 없습니다.")
+    try:
+        fps = _sane_fps(cap.get(cv2.CAP_PROP_FPS))
+        interval = 1.0 / target_fps if target_fps and not every_n else None
+        next_t = 0.0
+        idx = 0
+        while cap.grab():
+            if res is not None: res.frames_decoded += 1
+            pos = cap.get(cv2.CAP_PROP_POS_MSEC)
+            # 일부 백엔드는 POS_MSEC를 주지 않음(항상 0) → fps로 추정
+            t = pos / 1000.0 if pos > 0 or idx == 0 else idx / fps
+            if interval is not None:
+                take = t >= next_t
+                if take:
+                    while next_t <= t:
+                        next_t += interval
+            else:
+                take = idx % (every_n or 1) == 0
+            if take:
+                ok, frame = cap.retrieve()
+                if ok:
+                    frame = _fit_min_side(frame, min_side)
+                    yield idx, t, Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            idx += 1
+    finally:
+        cap.release()
+
+def video_info(path: str) -> tuple[float, int]:
+    """(fps, 총 프레임 수). fps는 컨테이너가 보고한 값(참고용), 프레임 수는 모르면 0
+    (webm 등은 0이나 음수를 주기도 함)."""
+    import cv2
+    cap = cv2.VideoCapture(path)
+    try:
+        return cap.get(cv2.CAP_PROP_FPS) or 0.0, max(0, int(cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0))
+    finally:
+        cap.release()
+
+def merge_segments(times, probs: np.ndarray, labels: list[str], smooth: int = 5,
+                   tail: float | None = None) -> list[Segment]:
+    """샘플 시각·확률 → 최근 smooth개 확률의 이동 평균으로 평활한 뒤 같은 최상위 라벨이 이어지는 구간으로 묶음.
+
+    샘플 i는 [times[i], times[i+1]) 을 대표하므로 구간의 끝은 다음 구간의 시작과 같다.
+    마지막 샘플은 tail초를 대표한다 (None이면 샘플 간격의 중앙값)."""
+    times = np.asarray(times, dtype=np.float64)
+    probs = np.asarray(probs, dtype=np.float64)
+    n = len(times)
+    if n == 0:
+        return []
+    if tail is None:
+        tail = float(np.median(np.diff(times))) if n > 1 else 0.0
+    w = max(1, smooth)
+    csum = np.vstack([np.zeros((1, probs.shape[1])), np.cumsum(probs, axis=0)])
+    lo = np.maximum(np.arange(n) - w + 1, 0)
+    avg = (csum[1:] - csum[lo]) / (np.arange(n) - lo + 1)[:, None]
+    top = avg.argmax(axis=1)
+    ends = np.append(times[1:], times[-1] + tail)
+
+    segments: list[Segment] = []
+    first = 0
+    for i in range(1, n + 1):
+        if i < n and top[i] == top[first]:
+            continue
+        k = int(top[first])
+        segments.append(Segment(float(times[first]), float(ends[i - 1]), labels[k],
+                                float(avg[first:i, k].mean()), i - first))
+        first = i
+    return segments
+
+def classify_video(predictor, path: str, labels: list[str], every_n: int | None = None,
+                   target_fps: float | None = None, bs: int = 16, smooth: int = 5,
+                   min_side: int | None = None, on_progress=None) -> VideoResult:
+    """predictor.predict_probs로 샘플 프레임을 bs장씩 분류한 뒤 merge_segments로 구간을 묶는다.
+    on_progress(디코딩한 프레임 수, 총 프레임 수) — 총 프레임 수를 모르면 0."""
+    src_fps, total = video_info(path)
+    res = VideoResult(src_fps=src_fps)
+    times, chunks = [], []
+    t0 = time.perf_counter()
+
+    batch = []
+    def flush():
+        chunks.append(np.asarray(predictor.predict_probs([img for _, _, img in batch])))
+        times.extend(t for _, t, _ in batch)
+        res.frames_classified += len(batch)
+        batch.clear()
+
+    for idx, t, img in iter_frames(path, every_n, target_fps, min_side, res):
+        batch.append((idx, t, img))
+        if len(batch) == bs:
+            flush()
+            if on_progress: on_progress(res.frames_decoded, total)
+    if batch:
+        flush()
+    if chunks:
+        # 샘플이 하나뿐이면 간격을 알 수 없으므로 샘플링 설정으로 추정
+        tail = None if len(times) > 1 else (1.0 / target_fps if target_fps and not every_n
+                                            else (every_n or 1) / _sane_fps(src_fps))
+        res.segments = merge_segments(times, np.concatenate(chunks), labels, smooth, tail)
+    res.elapsed = time.perf_counter() - t0
+    if on_progress: on_progress(res.frames_decoded, total)
+    return res